@@ -1,10 +1,7 @@
 """Configuration settings for the adaptive learning system."""  
+import json  
 import os  
-from pathlib import Path  
-from pydantic_settings import BaseSettings  
-from typing import List  
-import os  
-from pathlib import Path
+from dataclasses import dataclass, field
   
 # Algorithm configuration  
 ALGORITHM_CONFIG = {  
@@ -32,25 +29,25 @@ BKT_CONFIG = {
 }
   
 
-class Settings(BaseSettings):  
+# Optional override of the component weights, e.g. for A/B tests:  
+# ALGORITHM_WEIGHTS='{"learning_style": 0.2, ...}'  
+if 'ALGORITHM_WEIGHTS' in os.environ:  
+    ALGORITHM_CONFIG['weights'] = json.loads(os.environ['ALGORITHM_WEIGHTS'])
+  
+# Algorithm Weights (from paper - Equation 5), must sum to 1.0  
+ALGORITHM_WEIGHTS = ALGORITHM_CONFIG['weights']
+
+  
+@dataclass(frozen=True)  
+class Settings:  
     """  
-    API settings loaded from environment variables.
+    Read-only view of the module-level configuration.
       
-    Create a .env file with these variables for local development.  
+    Values are resolved once at import; environment overrides are read  
+    with os.environ rather than a settings framework.  
     """
       
-     
-    # Algorithm Weights (from paper - Equation 5)  
-    # These are the default weights, can be overridden by A/B tests  
-    @property  
-    def ALGORITHM_WEIGHTS(self) -> dict:  
-        """Get algorithm component weights (must sum to 1.0)."""  
-        return ALGORITHM_CONFIG['weights']
-      
-    
-    class Config:  
-        env_file = ".env"  
-        case_sensitive = True
+    ALGORITHM_WEIGHTS: dict = field(default_factory=lambda: ALGORITHM_WEIGHTS)
 
   
 # Create settings instance  
@@ -1,13 +1,22 @@
 """Main adaptive learning algorithm implementation."""  
+import math  
 import numpy as np  
 from typing import Dict, List, Tuple, Optional  
 import logging
+from collections import OrderedDict  
 from adaptive_algorithm.models.schemas import  Content, StudentState, Topic, Observation  
 from .scoring import ScoringComponents  
-from .knowledge_tracing import BayesianKnowledgeTracing  
+from .knowledge_tracing import BayesianKnowledgeTracing, _clip01, _NUMBA_AVAILABLE  
+from .catalog import CatalogIndex, TopicIndex, SCORE_DTYPE, mastery_vecs  
 from adaptive_algorithm.config.settings import ALGORITHM_CONFIG
   
 logger = logging.getLogger(__name__)
+  
+# Number of packed catalogs kept per algorithm instance  
+CATALOG_CACHE_SIZE = 8
+  
+# Order of the weighted components in Equation 5 (rows of the weight vector)  
+WEIGHT_NAMES = ('learning_style', 'difficulty', 'cognitive_load', 'knowledge_gap', 'engagement')
 
   
 class AdaptiveLearningAlgorithm:  
@@ -35,13 +44,8 @@ class AdaptiveLearningAlgorithm:
             cl_max: Maximum cognitive load threshold  
             beta_0: Initial exploration parameter  
         """  
-        # Load weights from config or use provided  
-        self.weights = weights or ALGORITHM_CONFIG['weights']
-          
-        # Validate weights sum to 1  
-        weight_sum = sum(self.weights.values())  
-        if abs(weight_sum - 1.0) > 0.01:  
-            raise ValueError(f"Weights must sum to 1.0, got {weight_sum}")
+        # Load weights from config or use provided (validated on assignment)  
+        self._assign_weights(weights or ALGORITHM_CONFIG['weights'])
           
         # Algorithm parameters  
         self.zpd_delta = zpd_delta or ALGORITHM_CONFIG['zpd_delta']  
@@ -58,7 +62,13 @@ class AdaptiveLearningAlgorithm:
         # Tracking  
         self.time_step = 0
           
-        logger.info(f"Algorithm initialized with weights: {self.weights}")
+        # Ordering of the last topic dictionary seen  
+        self._topic_index: Optional[TopicIndex] = None
+          
+        # Packed catalogs keyed by id() of the content list (LRU)  
+        self._catalog_cache: 'OrderedDict[int, CatalogIndex]' = OrderedDict()
+          
+        logger.info("Algorithm initialized with weights: %s", self.weights)
       
     def select_optimal_content(  
         self,  
@@ -77,48 +87,57 @@ class AdaptiveLearningAlgorithm:
         Returns:  
             Tuple of (selected_content, component_scores)  
         """  
+        catalog = self._get_catalog_index(available_content)  
+        mastery = catalog.topic_mastery(student)
+          
         # Filter eligible content based on constraints  
-        eligible_content = self._filter_eligible_content(  
-            available_content, student, topics  
-        )
+        eligible_mask = self._eligibility_mask(catalog, student, topics, mastery)
           
-        if not eligible_content:  
-            logger.warning(f"No eligible content for student {student.student_id}")  
+        if not eligible_mask.any():  
+            logger.warning("No eligible content for student %s", student.student_id)  
             # Fallback: return easiest available content  
             return min(available_content, key=lambda c: c.difficulty), {}
           
         # Calculate overall knowledge level K(st)  
-        topic_weights = {  
-            tid: topics[tid].importance_weight  
-            for tid in student.knowledge_state.keys()  
-            if tid in topics  
-        }  
-        knowledge_level = self.bkt.estimate_knowledge_level(  
-            student.knowledge_state, topic_weights  
-        )
-          
-        # Score all eligible content  
-        best_content = None  
-        best_score = -np.inf  
-        best_components = {}
-          
-        for content in eligible_content:  
-            score, components = self._calculate_score(  
-                content, student, knowledge_level  
-            )
-              
-            if score > best_score:  
-                best_score = score  
-                best_content = content  
-                best_components = components
+        knowledge_level = self._knowledge_level(student, topics)
+          
+        # Score the whole catalog at once, then pick the best eligible item  
+        beta_t, log_N = self._exploration_params(student)  
+        if _NUMBA_AVAILABLE:  
+            # Fused kernel; only the winner's components are recomputed  
+            scores = self.scoring.score_catalog(  
+                catalog, student, mastery, eligible_mask, knowledge_level,  
+                self._weight_vec, self.zpd_delta, self.zpd_sigma, self.cl_optimal,  
+                beta_t, log_N, out=catalog.score_buf  
+            )  
+            best_idx = int(scores.argmax())  
+            best_content = available_content[best_idx]  
+            best_score = float(scores[best_idx])  
+            _, best_components = self._calculate_score(  
+                best_content, student, knowledge_level, beta_t, log_N  
+            )  
+        else:  
+            scores, component_arrays = self._calculate_scores_batch(  
+                catalog, student, knowledge_level, beta_t, log_N, mastery,  
+                out=catalog.score_buf  
+            )  
+            # Invert the mask in place, it is not needed afterwards  
+            ineligible = np.logical_not(eligible_mask, out=eligible_mask)  
+            np.copyto(scores, -np.inf, where=ineligible)  
+            best_idx = int(scores.argmax())  
+            best_content = available_content[best_idx]  
+            best_score = float(scores[best_idx])  
+            best_components = {  
+                name: float(values[best_idx]) for name, values in component_arrays.items()  
+            }
           
         self.time_step += 1
           
         logger.info(  
-            f"Selected content '{best_content.id}' with score {best_score:.3f} "  
-            f"for student {student.student_id}"  
+            "Selected content '%s' with score %.3f for student %s",  
+            best_content.id, best_score, student.student_id  
         )  
-        logger.debug(f"Component scores: {best_components}")
+        logger.debug("Component scores: %s", best_components)
           
         return best_content, best_components
       
@@ -126,13 +145,21 @@ class AdaptiveLearningAlgorithm:
         self,  
         content: Content,  
         student: StudentState,  
-        knowledge_level: float  
+        knowledge_level: float,  
+        beta_t: Optional[float] = None,  
+        log_N: Optional[float] = None  
     ) -> Tuple[float, Dict[str, float]]:  
         """  
         Calculate total score for content.
           
-        S(c,st,t) = Σ wi·fi(c,st,t) + E(c,st,t)  
+        S(c,st,t) = Σ wi·fi(c,st,t) + E(c,st,t)
+          
+        beta_t and log_N are the exploration invariants from  
+        _exploration_params; they are computed here when not supplied.  
         """  
+        if beta_t is None or log_N is None:  
+            beta_t, log_N = self._exploration_params(student)
+          
         # Calculate each component  
         ls_score = self.scoring.learning_style_match(content, student)
           
@@ -149,21 +176,76 @@ class AdaptiveLearningAlgorithm:
           
         eng_score = self.scoring.engagement_prediction(content, student)
           
-        e_bonus = self.scoring.exploration_bonus(  
-            content, student.total_interactions,  
-            self.beta_0, self.time_step  
+        e_bonus = self.scoring.exploration_bonus_precomputed(  
+            content.interaction_count, beta_t, log_N  
         )
           
-        # Weighted sum (Equation 5)  
-        total_score = (  
-            self.weights['learning_style'] * ls_score +  
-            self.weights['difficulty'] * d_score +  
-            self.weights['cognitive_load'] * cl_score +  
-            self.weights['knowledge_gap'] * kg_score +  
-            self.weights['engagement'] * eng_score +  
-            e_bonus  
+        # Weighted sum (Equation 5), specialized to the current weights  
+        total_score = self._score_fn(ls_score, d_score, cl_score, kg_score, eng_score, e_bonus)
+          
+        components = {  
+            'learning_style': ls_score,  
+            'difficulty': d_score,  
+            'cognitive_load': cl_score,  
+            'knowledge_gap': kg_score,  
+            'engagement': eng_score,  
+            'exploration': e_bonus,  
+            'total': total_score  
+        }
+          
+        return total_score, components
+      
+    def _calculate_scores_batch(  
+        self,  
+        catalog: CatalogIndex,  
+        student: StudentState,  
+        knowledge_level: float,  
+        beta_t: float,  
+        log_N: float,  
+        mastery: Optional[np.ndarray] = None,  
+        out: Optional[np.ndarray] = None  
+    ) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:  
+        """  
+        Calculate total scores for every content in a packed catalog.
+          
+        Vectorized form of _calculate_score: each component is evaluated  
+        as an array over the catalog and combined as W · f(c,st).  
+        mastery is the per-content topic mastery, looked up when omitted;  
+        totals are written into out when given.  
+        """  
+        if mastery is None:  
+            mastery = catalog.topic_mastery(student)
+          
+        ls_score = self.scoring.learning_style_match_batch(  
+            catalog.content_type_idx, student  
+        )
+          
+        d_score = self.scoring.difficulty_appropriateness_batch(  
+            catalog.difficulty, knowledge_level,  
+            self.zpd_delta, self.zpd_sigma  
+        )
+          
+        cl_score = self.scoring.cognitive_load_optimization_batch(  
+            catalog.difficulty, catalog.intrinsic_load, student, self.cl_optimal  
         )
           
+        kg_score = 1 - mastery
+          
+        eng_score = self.scoring.engagement_prediction_batch(  
+            ls_score, catalog.difficulty, student  
+        )
+          
+        e_bonus = self.scoring.exploration_bonus_batch(  
+            catalog.interaction_count, beta_t, log_N  
+        )
+          
+        # Weighted sum (Equation 5)  
+        total_score = np.matmul(  
+            self._weight_vec, np.vstack((ls_score, d_score, cl_score, kg_score, eng_score)),  
+            out=out  
+        )  
+        total_score += e_bonus
+          
         components = {  
             'learning_style': ls_score,  
             'difficulty': d_score,  
@@ -176,41 +258,116 @@ class AdaptiveLearningAlgorithm:
           
         return total_score, components
       
+    def _exploration_params(self, student: StudentState) -> Tuple[float, float]:  
+        """  
+        Loop invariants of the exploration bonus (Equation 15).
+          
+        Returns:  
+            Tuple of (β_t, ln(N_t + 1))  
+        """  
+        beta_t = self.beta_0 / (1 + math.log(self.time_step + 1))  
+        log_N = math.log(student.total_interactions + 1)  
+        return beta_t, log_N
+      
+    def _knowledge_level(self, student: StudentState, topics: Dict[str, Topic]) -> float:  
+        """Overall knowledge level K(st) over the topics the student has seen."""  
+        if not student.knowledge_state:  
+            return 0.0
+          
+        topic_index = self._get_topic_index(topics)  
+        masteries, known = mastery_vecs(student, topic_index.topic_ids)  
+        return self.bkt.estimate_knowledge_level_vec(  
+            masteries, topic_index.importance, known  
+        )
+      
+    def _get_topic_index(self, topics: Dict[str, Topic]) -> TopicIndex:  
+        """Return the index of a topic dictionary, rebuilding it when it changes."""  
+        topic_index = self._topic_index  
+        if topic_index is None or not topic_index.is_current(topics):  
+            topic_index = self._topic_index = TopicIndex.from_topics(topics)  
+        return topic_index
+      
+    def _get_catalog_index(self, available_content: List[Content]) -> CatalogIndex:  
+        """  
+        Return the packed arrays for a catalog, building them on first use.
+          
+        Catalogs are cached by list identity and rebuilt when their length  
+        or a content's topic changes. The other per-row attributes, notably  
+        the interaction counts driving exploration, are re-read on every call.  
+        """  
+        key = id(available_content)  
+        catalog = self._catalog_cache.get(key)  
+        if catalog is None or catalog.contents is not available_content:  
+            catalog = CatalogIndex.from_contents(available_content)  
+        elif not (catalog.is_current(available_content) and catalog.refresh()):  
+            catalog = catalog.rebuild()
+          
+        self._catalog_cache[key] = catalog  
+        self._catalog_cache.move_to_end(key)  
+        if len(self._catalog_cache) > CATALOG_CACHE_SIZE:  
+            self._catalog_cache.popitem(last=False)  
+        return catalog
+      
+    def clear_catalog_cache(self) -> None:  
+        """Drop all packed catalogs."""  
+        self._catalog_cache.clear()
+      
     def _filter_eligible_content(  
         self,  
         content_list: List[Content],  
         student: StudentState,  
         topics: Dict[str, Topic]  
     ) -> List[Content]:  
+        """Filter content based on pedagogical constraints (see _eligibility_mask)."""  
+        catalog = self._get_catalog_index(content_list)  
+        mask = self._eligibility_mask(  
+            catalog, student, topics, catalog.topic_mastery(student)  
+        )  
+        return [content for content, ok in zip(content_list, mask) if ok]
+      
+    def _eligibility_mask(  
+        self,  
+        catalog: CatalogIndex,  
+        student: StudentState,  
+        topics: Dict[str, Topic],  
+        mastery: np.ndarray  
+    ) -> np.ndarray:  
         """  
-        Filter content based on pedagogical constraints.
+        Evaluate the pedagogical constraints for a whole catalog at once.
           
         Constraints from equation (18):  
         1. Prerequisites(c) ⊆ Mastered(st)  
         2. D(c) ∈ ZPD(st)  
-        3. CL_projected(c,st) < CL_max  
-        """  
-        eligible = []
+        3. CL_projected(c,st) < CL_max
           
-        for content in content_list:  
-            # Constraint 1: Check prerequisites  
-            topic = topics.get(content.topic_id)  
-            if topic and not self._prerequisites_met(topic, student):  
-                continue
-              
-            # Constraint 2: Check ZPD  
-            knowledge_level = student.knowledge_state.get(content.topic_id, 0.0)  
-            if not self._in_zpd(content.difficulty, knowledge_level):  
-                continue
+        Args:  
+            catalog: Packed catalog  
+            student: Student state  
+            topics: Dictionary of topics  
+            mastery: Mastery of each content's topic
+          
+        Returns:  
+            Boolean mask of eligible rows  
+        """  
+        # Constraint 1: Check prerequisites as one gather over the student's  
+        # mastery vector (-1 pads rows with fewer prerequisites)  
+        topic_index = self._get_topic_index(topics)  
+        prereq_idx = catalog.prerequisite_index(topic_index)  
+        topic_mastery, _ = mastery_vecs(student, topic_index.topic_ids)  
+        mask = (  
+            (topic_mastery[prereq_idx] >= self.mastery_threshold) | (prereq_idx == -1)  
+        ).all(axis=1)
               
-            # Constraint 3: Check cognitive load  
-            projected_load = self.scoring._estimate_projected_load(content, student)  
-            if projected_load > self.cl_max:  
-                continue
+        # Constraint 2: Check ZPD  
+        mask &= self._in_zpd(catalog.difficulty, mastery)
               
-            eligible.append(content)
+        # Constraint 3: Check cognitive load  
+        projected_load = self.scoring._estimate_projected_load_batch(  
+            catalog.difficulty, catalog.intrinsic_load, student  
+        )  
+        mask &= projected_load <= self.cl_max
           
-        return eligible
+        return mask
       
     def _prerequisites_met(self, topic: Topic, student: StudentState) -> bool:  
         """Check if all prerequisites are mastered."""  
@@ -220,16 +377,18 @@ class AdaptiveLearningAlgorithm:
                 return False  
         return True
       
-    def _in_zpd(self, difficulty: float, knowledge_level: float) -> bool:  
+    def _in_zpd(self, difficulty, knowledge_level):  
         """  
         Check if difficulty is within Zone of Proximal Development.
           
-        ZPD range: [K(st) - margin, K(st) + δ + margin]  
+        ZPD range: [K(st) - margin, K(st) + δ + margin]
+          
+        Accepts scalars or aligned arrays.  
         """  
         margin = 0.1  
         lower_bound = knowledge_level - margin  
         upper_bound = knowledge_level + self.zpd_delta + margin  
-        return lower_bound <= difficulty <= upper_bound
+        return (lower_bound <= difficulty) & (difficulty <= upper_bound)
       
     def update_student_state(  
         self,  
@@ -251,43 +410,118 @@ class AdaptiveLearningAlgorithm:
         # Update mastered topics  
         if new_mastery >= 0.8 and observation.topic_id not in student.mastered_topics:  
             student.mastered_topics.append(observation.topic_id)  
-            logger.info(f"Student {student.student_id} mastered topic {observation.topic_id}")
+            logger.info("Student %s mastered topic %s", student.student_id, observation.topic_id)
           
         # Update performance history  
         performance_score = 1.0 if observation.correct else 0.0  
-        student.recent_performance.append(performance_score)  
-        if len(student.recent_performance) > 20:  
-            student.recent_performance = student.recent_performance[-20:]
+        student.recent_performance.append(performance_score)
           
         # Update cognitive load (exponential decay + new load)  
         decay_factor = 0.8  
-        student.current_cognitive_load = (  
+        student.current_cognitive_load = _clip01(  
             student.current_cognitive_load * decay_factor +  
             content.intrinsic_load * 0.2  
-        )  
-        student.current_cognitive_load = np.clip(  
-            student.current_cognitive_load, 0.0, 1.0  
         )
           
         # Update engagement history  
-        student.engagement_history.append(observation.engagement_score)  
-        if len(student.engagement_history) > 20:  
-            student.engagement_history = student.engagement_history[-20:]
+        student.engagement_history.append(observation.engagement_score)
           
         # Update interaction counts  
         student.total_interactions += 1
           
         logger.info(  
-            f"Updated student {student.student_id}: "  
-            f"Topic {observation.topic_id} mastery: {new_mastery:.3f}"  
+            "Updated student %s: Topic %s mastery: %.3f",  
+            student.student_id, observation.topic_id, new_mastery  
+        )
+          
+        return student
+      
+    def replay_observations(  
+        self,  
+        student: StudentState,  
+        observations: List[Observation]  
+    ) -> StudentState:  
+        """  
+        Replay a batch of observations through BKT (Equations 9-11).
+          
+        Equivalent to the knowledge, mastery and interaction-count updates  
+        of calling update_student_state once per observation, without the  
+        per-content cognitive load update. Intended for simulators and  
+        backtests replaying long observation logs.  
+        """  
+        if not observations:  
+            return student
+          
+        # Pack observations as (topic index, correct) arrays  
+        topic_index: Dict[str, int] = {}  
+        topic_idx = np.fromiter(  
+            (topic_index.setdefault(obs.topic_id, len(topic_index)) for obs in observations),  
+            dtype=np.intp, count=len(observations)  
+        )  
+        corrects = np.fromiter(  
+            (obs.correct for obs in observations), dtype=bool, count=len(observations)  
+        )  
+        masteries = np.fromiter(  
+            (student.knowledge_state.get(tid, 0.0) for tid in topic_index),  
+            dtype=np.float64, count=len(topic_index)  
+        )
+          
+        peaks = self.bkt.replay(masteries, topic_idx, corrects)
+          
+        for tid, i in topic_index.items():  
+            student.knowledge_state[tid] = float(masteries[i])  
+            if peaks[i] >= 0.8 and tid not in student.mastered_topics:  
+                student.mastered_topics.append(tid)
+          
+        # Histories are fixed-size buffers, only the tail can survive  
+        tail = observations[-student.recent_performance.capacity:]  
+        student.recent_performance.extend(1.0 if obs.correct else 0.0 for obs in tail)  
+        tail = observations[-student.engagement_history.capacity:]  
+        student.engagement_history.extend(obs.engagement_score for obs in tail)
+          
+        student.total_interactions += len(observations)
+          
+        logger.info(  
+            "Replayed %d observations for student %s", len(observations), student.student_id  
         )
           
         return student
       
     def set_weights(self, weights: Dict[str, float]) -> None:  
         """Update algorithm weights (for A/B testing)."""  
+        self._assign_weights(weights)  
+        logger.info("Updated weights: %s", weights)
+      
+    def _assign_weights(self, weights: Dict[str, float]) -> None:  
+        """  
+        Validate and install component weights.
+          
+        This is the only place the sum-to-1 check runs; scoring uses the  
+        compiled weight vector as is.  
+        """  
         weight_sum = sum(weights.values())  
         if abs(weight_sum - 1.0) > 0.01:  
             raise ValueError(f"Weights must sum to 1.0, got {weight_sum}")  
-        self.weights = weights  
-        logger.info(f"Updated weights: {weights}")  
\ No newline at end of file
+        self._weight_vec = self._compile_weights(weights)  
+        self._score_fn = self._compile_score_fn(weights)  
+        self.weights = weights
+      
+    @staticmethod  
+    def _compile_weights(weights: Dict[str, float]) -> np.ndarray:  
+        """Weights of the five scored components as a vector (Equation 5 order)."""  
+        return np.array([weights[name] for name in WEIGHT_NAMES], dtype=SCORE_DTYPE)
+      
+    @staticmethod  
+    def _compile_score_fn(weights: Dict[str, float]):  
+        """  
+        Scalar form of Equation 5 with the weights bound as constants.
+          
+        Returns:  
+            Function (ls, d, cl, kg, eng, e) -> total score  
+        """  
+        w_ls, w_d, w_cl, w_kg, w_eng = (float(weights[name]) for name in WEIGHT_NAMES)
+          
+        def score_fn(ls, d, cl, kg, eng, e):  
+            return w_ls * ls + w_d * d + w_cl * cl + w_kg * kg + w_eng * eng + e
+          
+        return score_fn  
\ No newline at end of file
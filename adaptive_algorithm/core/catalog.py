@@ -0,0 +1,233 @@
+"""Structure-of-arrays index of a content catalog for batched scoring."""  
+from dataclasses import dataclass, field  
+from itertools import count, repeat  
+from typing import Dict, List, Optional, Tuple  
+import numpy as np  
+from adaptive_algorithm.models.schemas import Content, ContentType, StudentState, Topic
+
+  
+# Scores live in [0, 1] and are well conditioned in single precision  
+SCORE_DTYPE = np.float32
+  
+# Rows of the style-affinity matrix follow ContentType.idx; unknown types  
+# map to the extra last row  
+UNKNOWN_CONTENT_TYPE_IDX = len(ContentType)
+  
+# Identifies topic indexes in the catalogs' prerequisite caches  
+_index_uids = count()
+
+  
+def content_type_row(content_type) -> int:  
+    """Row of the style-affinity matrix for a content type."""  
+    if isinstance(content_type, ContentType):  
+        return content_type.idx  
+    return UNKNOWN_CONTENT_TYPE_IDX
+
+  
+def mastery_vecs(student, topic_ids: List[str]) -> Tuple[np.ndarray, np.ndarray]:  
+    """  
+    Mastery of each topic in topic_ids order, read from knowledge_state.
+      
+    Works with any student model that has a knowledge_state dict. Not  
+    cached: one gather over the topic list per call, so direct writes to  
+    knowledge_state are always seen.
+      
+    Returns:  
+        Tuple of (mastery, known) where known is 1.0 for topics present  
+        in knowledge_state and 0.0 otherwise  
+    """  
+    knowledge_state, n = student.knowledge_state, len(topic_ids)  
+    mastery = np.fromiter(  
+        map(knowledge_state.get, topic_ids, repeat(0.0)), dtype=SCORE_DTYPE, count=n  
+    )  
+    known = np.fromiter(  
+        map(knowledge_state.__contains__, topic_ids), dtype=SCORE_DTYPE, count=n  
+    )  
+    return mastery, known
+
+  
+def _topic_signature(topics: Dict[str, Topic]) -> List[Tuple]:  
+    """Ordering, Topic objects, importance weights and prerequisites of a topic dictionary."""  
+    return [  
+        (tid, topic, topic.importance_weight, tuple(topic.prerequisites))  
+        for tid, topic in topics.items()  
+    ]
+
+  
+@dataclass  
+class CatalogIndex:  
+    """  
+    Content attributes packed as parallel arrays (one row per content).
+      
+    Built once per catalog so that the scoring function (Equation 5) can be  
+    evaluated for every candidate with vectorized NumPy expressions instead  
+    of per-item attribute access. Attributes are snapshotted when the  
+    index is built and re-read by refresh. score_buf is shared scratch  
+    space, so an index must not be scored from several threads at once.  
+    """
+      
+    contents: List[Content]  
+    difficulty: np.ndarray  # dc in Equation 7  
+    intrinsic_load: np.ndarray  # Used in Equation 12  
+    interaction_count: np.ndarray  # Nc in Equation 15  
+    topic_id_idx: np.ndarray  # Row -> index into topic_ids  
+    content_type_idx: np.ndarray  # Row -> row of the style-affinity matrix  
+    topic_ids: List[str]  # Unique topic ids referenced by the catalog  
+    topic_position: Dict[str, int]  # Inverse of topic_ids  
+    score_buf: np.ndarray  # Reused total-score output of the batched scorer  
+    version: int = 0  # Incremented each time the catalog is rebuilt  
+    # (topic index uid, per-row prerequisite positions) of the last lookup  
+    _prereq_cache: Optional[Tuple[int, np.ndarray]] = field(  
+        default=None, init=False, repr=False, compare=False  
+    )
+      
+    @classmethod  
+    def from_contents(cls, contents: List[Content], version: int = 0) -> 'CatalogIndex':  
+        """Pack a list of Content into parallel arrays."""  
+        n = len(contents)  
+        topic_position = {}  
+        topic_id_idx = np.empty(n, dtype=np.intp)  
+        for i, content in enumerate(contents):  
+            topic_id_idx[i] = topic_position.setdefault(content.topic_id, len(topic_position))
+          
+        return cls(  
+            contents=contents,  
+            difficulty=np.fromiter((c.difficulty for c in contents), dtype=SCORE_DTYPE, count=n),  
+            intrinsic_load=np.fromiter((c.intrinsic_load for c in contents), dtype=SCORE_DTYPE, count=n),  
+            interaction_count=np.fromiter((c.interaction_count for c in contents), dtype=SCORE_DTYPE, count=n),  
+            topic_id_idx=topic_id_idx,  
+            content_type_idx=np.fromiter(  
+                (content_type_row(c.content_type) for c in contents),  
+                dtype=np.intp, count=n  
+            ),  
+            topic_ids=list(topic_position),  
+            topic_position=topic_position,  
+            score_buf=np.empty(n, dtype=SCORE_DTYPE),  
+            version=version  
+        )
+      
+    def __len__(self) -> int:  
+        return len(self.difficulty)
+      
+    def is_current(self, contents: List[Content]) -> bool:  
+        """Check whether this index still describes the given content list."""  
+        return self.contents is contents and len(self.contents) == len(self.difficulty)
+      
+    def refresh(self) -> bool:  
+        """  
+        Re-read the per-row attributes from the (possibly mutated) contents.
+          
+        interaction_count (Nc) changes after every selection, and difficulty,  
+        intrinsic load and content type may be edited in place, so all are  
+        re-read. Returns False if a row's topic changed; the topic layout is  
+        then out of date and the index must be rebuilt.  
+        """  
+        contents, n = self.contents, len(self.contents)  
+        topic_ids = self.topic_ids  
+        if any(c.topic_id != topic_ids[t] for c, t in zip(contents, self.topic_id_idx.tolist())):  
+            return False  
+        self.interaction_count[:] = np.fromiter(  
+            (c.interaction_count for c in contents), dtype=SCORE_DTYPE, count=n  
+        )  
+        self.difficulty[:] = np.fromiter((c.difficulty for c in contents), dtype=SCORE_DTYPE, count=n)  
+        self.intrinsic_load[:] = np.fromiter((c.intrinsic_load for c in contents), dtype=SCORE_DTYPE, count=n)  
+        self.content_type_idx[:] = np.fromiter(  
+            (content_type_row(c.content_type) for c in contents), dtype=np.intp, count=n  
+        )  
+        return True
+      
+    def rebuild(self) -> 'CatalogIndex':  
+        """Re-pack the (mutated) content list as the next version."""  
+        return CatalogIndex.from_contents(self.contents, self.version + 1)
+      
+    def topic_mastery(self, student: StudentState) -> np.ndarray:  
+        """  
+        Mastery P(mastery) of each row's topic.
+          
+        Reads the student's knowledge once per unique topic, then expands  
+        to rows with a single gather.  
+        """  
+        mastery, _ = mastery_vecs(student, self.topic_ids)  
+        return mastery[self.topic_id_idx]
+      
+    def prerequisite_index(self, topic_index: 'TopicIndex') -> np.ndarray:  
+        """  
+        Prerequisites of each row's topic as positions in topic_index.
+          
+        Rows are padded with -1 to the widest prerequisite list; rows whose  
+        topic is not in the topic dictionary have no prerequisites. Cached  
+        for the most recent topic index (a rebuilt index has a new uid).  
+        """  
+        cached = self._prereq_cache  
+        if cached is not None and cached[0] == topic_index.uid:  
+            return cached[1]
+          
+        # Catalog topic -> row of topic_index.prereq_idx; unknown topics use  
+        # an all -1 row appended at the end  
+        n_topics, max_prereqs = topic_index.prereq_idx.shape  
+        padded = np.vstack((  
+            topic_index.prereq_idx, np.full((1, max_prereqs), -1, dtype=np.int32)  
+        ))  
+        # Positions past n_topics are prerequisite-only ids, not dictionary rows  
+        topic_rows = np.fromiter(  
+            map(topic_index.topic_position.get, self.topic_ids, repeat(n_topics)),  
+            dtype=np.intp, count=len(self.topic_ids)  
+        )  
+        np.minimum(topic_rows, n_topics, out=topic_rows)  
+        prereq_idx = padded[topic_rows[self.topic_id_idx]]  
+        self._prereq_cache = (topic_index.uid, prereq_idx)  
+        return prereq_idx
+
+  
+@dataclass  
+class TopicIndex:  
+    """  
+    Fixed ordering of a topic dictionary with its importance weights.
+      
+    Lets K(st) (Equation 8) be computed as a dot product against a  
+    student's mastery vector over the same ordering, and prerequisite  
+    checks (Equation 18) as a gather from that vector. Prerequisite ids  
+    that are not themselves in the dictionary are appended to the  
+    ordering with zero importance. is_current compares the dictionary  
+    with a snapshot taken at build time, so replaced topics, edited  
+    weights and edited prerequisite lists are picked up.  
+    """
+      
+    topics: Dict[str, Topic]  
+    topic_ids: List[str]  # Dictionary order, then unknown prerequisite ids  
+    topic_position: Dict[str, int]  
+    importance: np.ndarray  # wj in K(st), aligned with topic_ids  
+    prereq_idx: np.ndarray  # (n_topics, max_prereqs) positions, -1 padded  
+    uid: int  
+    signature: List[Tuple]  # Per-topic state the arrays were built from
+      
+    @classmethod  
+    def from_topics(cls, topics: Dict[str, Topic]) -> 'TopicIndex':  
+        """Index a topic dictionary in its iteration order."""  
+        topic_position = {tid: i for i, tid in enumerate(topics)}  
+        for topic in topics.values():  
+            for prereq_id in topic.prerequisites:  
+                topic_position.setdefault(prereq_id, len(topic_position))  
+        topic_ids = list(topic_position)
+          
+        max_prereqs = max((len(t.prerequisites) for t in topics.values()), default=0)  
+        prereq_idx = np.full((len(topics), max_prereqs), -1, dtype=np.int32)  
+        for i, topic in enumerate(topics.values()):  
+            for j, prereq_id in enumerate(topic.prerequisites):  
+                prereq_idx[i, j] = topic_position[prereq_id]
+          
+        importance = np.zeros(len(topic_ids), dtype=SCORE_DTYPE)  
+        importance[:len(topics)] = [t.importance_weight for t in topics.values()]  
+        return cls(  
+            topics=topics,  
+            topic_ids=topic_ids,  
+            topic_position=topic_position,  
+            importance=importance,  
+            prereq_idx=prereq_idx,  
+            uid=next(_index_uids),  
+            signature=_topic_signature(topics)  
+        )
+      
+    def is_current(self, topics: Dict[str, Topic]) -> bool:  
+        """Check whether this index still describes the given dictionary."""  
+        return self.topics is topics and self.signature == _topic_signature(topics)
@@ -1,6 +1,80 @@
 """Bayesian Knowledge Tracing implementation."""  
 import numpy as np  
 from typing import Dict
+  
+try:  
+    from numba import njit, prange  
+    _NUMBA_AVAILABLE = True  
+except ImportError:  # Optional dependency: fall back to the scalar update  
+    _NUMBA_AVAILABLE = False  
+    prange = range
+      
+    def njit(*args, **kwargs):  
+        """No-op stand-in for numba.njit."""  
+        if args and callable(args[0]):  
+            return args[0]  
+        return lambda func: func
+
+  
+def _clip01(x: float) -> float:  
+    """Clamp a scalar to [0, 1] without NumPy ufunc dispatch."""  
+    return 0.0 if x < 0.0 else (1.0 if x > 1.0 else x)
+
+  
+@njit(cache=True, fastmath=True)  
+def _bkt_step(m, a, b, p_learn):  
+    """  
+    Single BKT update in branch-free form.
+      
+    Equations (9) and (10) share the shape a·m / (a·m + b·(1 - m)) with  
+    (a, b) = (1 - p_slip, p_guess) for a correct answer and  
+    (p_slip, 1 - p_guess) otherwise; Equation (11) then adds learning.  
+    """  
+    numerator = a * m  
+    denominator = numerator + b * (1.0 - m)  
+    p = numerator / denominator if denominator > 0 else m  
+    return min(1.0, max(0.0, p + (1.0 - p) * p_learn))
+
+  
+@njit(cache=True, fastmath=True)  
+def _bkt_update_batch(masteries, corrects, p_slip, p_guess, p_learn):  
+    """  
+    Apply one BKT update (Equations 9-11) to each mastery independently.
+      
+    Args:  
+        masteries: float64 array of current mastery probabilities  
+        corrects: bool array of observed outcomes, aligned with masteries
+      
+    Returns:  
+        New float64 array of updated mastery probabilities  
+    """  
+    a1, a0 = 1.0 - p_slip, p_slip  
+    b1, b0 = p_guess, 1.0 - p_guess  
+    n = masteries.shape[0]  
+    updated = np.empty(n, dtype=np.float64)  
+    for i in range(n):  
+        c = corrects[i]  
+        updated[i] = _bkt_step(masteries[i], a1 if c else a0, b1 if c else b0, p_learn)  
+    return updated
+
+  
+@njit(cache=True, fastmath=True)  
+def _bkt_replay(masteries, peaks, topic_idx, corrects, p_slip, p_guess, p_learn):  
+    """  
+    Replay an ordered observation stream through BKT in place.
+      
+    Observation i updates masteries[topic_idx[i]]; peaks tracks the highest  
+    mastery each topic reached during the replay.  
+    """  
+    a1, a0 = 1.0 - p_slip, p_slip  
+    b1, b0 = p_guess, 1.0 - p_guess  
+    for i in range(topic_idx.shape[0]):  
+        t = topic_idx[i]  
+        c = corrects[i]  
+        m = _bkt_step(masteries[t], a1 if c else a0, b1 if c else b0, p_learn)  
+        masteries[t] = m  
+        if m > peaks[t]:  
+            peaks[t] = m
 
   
 class BayesianKnowledgeTracing:  
@@ -39,21 +113,80 @@ class BayesianKnowledgeTracing:
         Returns:  
             Updated mastery probability P(M_t)  
         """  
+        # Equations (9) and (10) differ only in the two likelihood terms:  
+        # P(obs | mastered) and P(obs | not mastered)  
         if correct:  
             # P(M_t | correct) - Equation (9)  
-            numerator = (1 - self.p_slip) * current_mastery  
-            denominator = numerator + self.p_guess * (1 - current_mastery)  
-            p_mastery_given_obs = numerator / denominator if denominator > 0 else current_mastery  
+            a, b = 1 - self.p_slip, self.p_guess  
         else:  
             # P(M_t | incorrect) - Equation (10)  
-            numerator = self.p_slip * current_mastery  
-            denominator = numerator + (1 - self.p_guess) * (1 - current_mastery)  
-            p_mastery_given_obs = numerator / denominator if denominator > 0 else current_mastery
+            a, b = self.p_slip, 1 - self.p_guess  
+        numerator = a * current_mastery  
+        denominator = numerator + b * (1 - current_mastery)  
+        p_mastery_given_obs = numerator / denominator if denominator > 0 else current_mastery
           
         # Update with learning - Equation (11)  
         updated_mastery = p_mastery_given_obs + (1 - p_mastery_given_obs) * self.p_learn
           
-        return np.clip(updated_mastery, 0.0, 1.0)
+        return _clip01(updated_mastery)
+      
+    def update_mastery_batch(self, masteries: np.ndarray,  
+                             corrects: np.ndarray) -> np.ndarray:  
+        """  
+        Update many independent mastery probabilities at once.
+          
+        Vectorized form of update_mastery, JIT-compiled with Numba when it  
+        is installed and evaluated with NumPy otherwise.
+          
+        Args:  
+            masteries: Current mastery probabilities P(M_t-1)  
+            corrects: Whether each answer was correct
+          
+        Returns:  
+            Updated mastery probabilities P(M_t)  
+        """  
+        masteries = np.ascontiguousarray(masteries, dtype=np.float64)  
+        corrects = np.ascontiguousarray(corrects, dtype=np.bool_)  
+        if _NUMBA_AVAILABLE:  
+            return _bkt_update_batch(  
+                masteries, corrects, self.p_slip, self.p_guess, self.p_learn  
+            )
+          
+        # Branch-free NumPy form of update_mastery  
+        a = np.where(corrects, 1 - self.p_slip, self.p_slip)  
+        b = np.where(corrects, self.p_guess, 1 - self.p_guess)  
+        numerator = a * masteries  
+        denominator = numerator + b * (1 - masteries)  
+        with np.errstate(divide='ignore', invalid='ignore'):  
+            p = np.where(denominator > 0, numerator / denominator, masteries)  
+        updated = p + (1 - p) * self.p_learn  
+        return np.clip(updated, 0.0, 1.0, out=updated)
+      
+    def replay(self, masteries: np.ndarray, topic_idx: np.ndarray,  
+               corrects: np.ndarray) -> np.ndarray:  
+        """  
+        Replay an ordered observation stream, updating masteries in place.
+          
+        Args:  
+            masteries: float64 mastery per topic, modified in place  
+            topic_idx: Index into masteries for each observation  
+            corrects: Outcome of each observation
+          
+        Returns:  
+            Peak mastery reached by each topic during the replay  
+        """  
+        peaks = np.zeros_like(masteries)  
+        topic_idx = np.ascontiguousarray(topic_idx, dtype=np.intp)  
+        corrects = np.ascontiguousarray(corrects, dtype=np.bool_)  
+        if _NUMBA_AVAILABLE:  
+            _bkt_replay(masteries, peaks, topic_idx, corrects,  
+                        self.p_slip, self.p_guess, self.p_learn)  
+            return peaks
+          
+        for t, correct in zip(topic_idx, corrects):  
+            masteries[t] = self.update_mastery(masteries[t], correct)  
+            peaks[t] = max(peaks[t], masteries[t])  
+        return peaks
       
     def estimate_knowledge_level(self, topic_masteries: Dict[str, float],  
                                  topic_weights: Dict[str, float]) -> float:  
@@ -78,4 +211,24 @@ class BayesianKnowledgeTracing:
         )  
         total_weight = sum(topic_weights.values())
           
-        return weighted_sum / total_weight if total_weight > 0 else 0.0  
\ No newline at end of file
+        return weighted_sum / total_weight if total_weight > 0 else 0.0
+      
+    def estimate_knowledge_level_vec(self, masteries: np.ndarray,  
+                                     weights: np.ndarray,  
+                                     known: np.ndarray) -> float:  
+        """  
+        Vectorized K(st) over a fixed topic ordering.
+          
+        Same result as estimate_knowledge_level restricted to the topics  
+        flagged in known.
+          
+        Args:  
+            masteries: Mastery per topic (0 for unseen topics)  
+            weights: Importance weight per topic  
+            known: 1.0 for topics the student has a mastery estimate for
+          
+        Returns:  
+            Overall knowledge level K(st)  
+        """  
+        total_weight = float(weights @ known)  
+        return float(weights @ masteries) / total_weight if total_weight > 0 else 0.0  
\ No newline at end of file
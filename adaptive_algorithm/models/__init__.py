@@ -11,6 +11,7 @@ from .schemas import (
 from .content import (  
     CaseStudy,  
     Quiz,  
+    ContentCatalog,  
     create_video_content,  
     create_text_content,  
     create_interactive_content  
@@ -32,7 +33,8 @@ __all__ = [
       
     # Specialized Content  
     'CaseStudy',  
-    'Quiz',
+    'Quiz',  
+    'ContentCatalog',
       
     # Factory Functions  
     'create_video_content',  
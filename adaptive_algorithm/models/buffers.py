@@ -0,0 +1,95 @@
+"""Fixed-size history buffers for student state."""  
+from typing import Iterable, Iterator, List  
+import numpy as np
+
+  
+class RingBuffer:  
+    """  
+    Fixed-capacity FIFO of floats backed by a preallocated ndarray.
+      
+    Appending is O(1) with no allocation; once full, the oldest value is  
+    overwritten. Supports the list operations used on history fields  
+    (append, extend, len, iteration, indexing and slicing) so it can stand  
+    in for a trimmed List[float].  
+    """
+      
+    def __init__(self, capacity: int, values: Iterable[float] = (),  
+                 dtype=np.float32):  
+        if capacity <= 0:  
+            raise ValueError(f"Capacity must be positive, got {capacity}")  
+        self._buf = np.zeros(capacity, dtype=dtype)  
+        self._cursor = 0  # Next write position  
+        self._filled = 0  # Number of valid entries  
+        self.extend(values)
+      
+    @property  
+    def capacity(self) -> int:  
+        return self._buf.shape[0]
+      
+    def append(self, value: float) -> None:  
+        """Append a value, evicting the oldest one when full."""  
+        self._buf[self._cursor] = value  
+        self._cursor = (self._cursor + 1) % self._buf.shape[0]  
+        if self._filled < self._buf.shape[0]:  
+            self._filled += 1
+      
+    def extend(self, values: Iterable[float]) -> None:  
+        for value in values:  
+            self.append(value)
+      
+    def clear(self) -> None:  
+        self._cursor = 0  
+        self._filled = 0
+      
+    def mean_last(self, k: int, default: float = 0.5) -> float:  
+        """  
+        Mean of the k most recent values (default when empty).
+          
+        Meant for small k: walks back from the cursor summing scalars,  
+        without slicing or calling a NumPy reduction.  
+        """  
+        n = min(k, self._filled)  
+        if n == 0:  
+            return default  
+        buf = self._buf  
+        i = self._cursor  
+        total = 0.0  
+        for _ in range(n):  
+            i = (i or buf.shape[0]) - 1  
+            total += buf.item(i)  
+        return total / n
+      
+    def to_array(self) -> np.ndarray:  
+        """Values oldest to newest as a new ndarray."""  
+        if self._filled < self._buf.shape[0]:  
+            return self._buf[:self._filled].copy()  
+        return np.roll(self._buf, -self._cursor)
+      
+    def to_list(self) -> List[float]:  
+        """Values oldest to newest as Python floats."""  
+        return self.to_array().tolist()
+      
+    def __len__(self) -> int:  
+        return self._filled
+      
+    def __iter__(self) -> Iterator[float]:  
+        return iter(self.to_list())
+      
+    def __getitem__(self, key):  
+        if isinstance(key, slice):  
+            return self.to_list()[key]  
+        if not -self._filled <= key < self._filled:  
+            raise IndexError("RingBuffer index out of range")  
+        if key < 0:  
+            key += self._filled  
+        return float(self._buf[(self._cursor - self._filled + key) % self._buf.shape[0]])
+      
+    def __eq__(self, other) -> bool:  
+        if isinstance(other, RingBuffer):  
+            return self.to_list() == other.to_list()  
+        if isinstance(other, list):  
+            return self.to_list() == other  
+        return NotImplemented
+      
+    def __repr__(self) -> str:  
+        return f"RingBuffer({self.to_list()!r}, capacity={self.capacity})"
@@ -8,13 +8,16 @@ Based on the paper's content representation with:
 - Topic associations  
 """
   
+from bisect import bisect_right  
 from dataclasses import dataclass, field  
-from typing import Dict, List, Optional, Any  
+from typing import Dict, List, Optional, Any, Tuple  
 from datetime import datetime  
-from enum import Enum
+import numpy as np  
+from .schemas import IndexedEnum  
+from .fastpath import _VALIDATE, fast_new, generate_to_dict
 
   
-class ContentType(Enum):  
+class ContentType(IndexedEnum):  
     """  
     Types of learning content.
       
@@ -28,7 +31,24 @@ class ContentType(Enum):
     CASE_STUDY = "case_study"
 
   
-@dataclass  
+# Value -> member, avoids the Enum constructor when deserializing  
+_CONTENT_TYPE_BY_VALUE = {member.value: member for member in ContentType}
+
+  
+def _content_type_from_value(value: str) -> ContentType:  
+    """Look up a ContentType by value (the constructor raises for unknown values)."""  
+    member = _CONTENT_TYPE_BY_VALUE.get(value)  
+    return member if member is not None else ContentType(value)
+  
+# Label i covers values from thresholds[i - 1] (inclusive) to thresholds[i]  
+_DIFFICULTY_THRESHOLDS = (0.3, 0.6, 0.8)  
+_DIFFICULTY_LABELS = ("Easy", "Moderate", "Challenging", "Advanced")  
+_COGNITIVE_LOAD_THRESHOLDS = (0.3, 0.7)  
+_COGNITIVE_LOAD_LABELS = ("Low", "Moderate", "High")
+
+  
+@generate_to_dict  
+@dataclass(slots=True)  
 class Content:  
     """  
     Represents a piece of learning content.
@@ -58,63 +78,49 @@ class Content:
     learning_objectives: List[str] = field(default_factory=list)  
     tags: List[str] = field(default_factory=list)
       
+    # Row in the ContentCatalog this content was added to (-1 if none)  
+    row_index: int = field(default=-1, init=False, repr=False, compare=False)
+      
+    # (created_at, updated_at, their ISO strings) as of the last to_dict,  
+    # see generate_to_dict  
+    _iso_cache: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+      
     def __post_init__(self):  
         """Validate content attributes."""  
-        if not 0 <= self.difficulty <= 1:  
-            raise ValueError(f"Difficulty must be in [0, 1], got {self.difficulty}")
+        if _VALIDATE:  
+            if not 0 <= self.difficulty <= 1:  
+                raise ValueError(f"Difficulty must be in [0, 1], got {self.difficulty}")
           
-        if not 0 <= self.intrinsic_load <= 1:  
-            raise ValueError(f"Intrinsic load must be in [0, 1], got {self.intrinsic_load}")
+            if not 0 <= self.intrinsic_load <= 1:  
+                raise ValueError(f"Intrinsic load must be in [0, 1], got {self.intrinsic_load}")
           
-        if self.estimated_duration <= 0:  
-            raise ValueError(f"Duration must be positive, got {self.estimated_duration}")
+            if self.estimated_duration <= 0:  
+                raise ValueError(f"Duration must be positive, got {self.estimated_duration}")
           
         if isinstance(self.content_type, str):  
-            self.content_type = ContentType(self.content_type)
+            self.content_type = _content_type_from_value(self.content_type)
       
     def get_difficulty_label(self) -> str:  
         """Get human-readable difficulty label."""  
-        if self.difficulty < 0.3:  
-            return "Easy"  
-        elif self.difficulty < 0.6:  
-            return "Moderate"  
-        elif self.difficulty < 0.8:  
-            return "Challenging"  
-        else:  
-            return "Advanced"
+        return _DIFFICULTY_LABELS[bisect_right(_DIFFICULTY_THRESHOLDS, self.difficulty)]
       
     def get_cognitive_load_label(self) -> str:  
         """Get cognitive load label."""  
-        if self.intrinsic_load < 0.3:  
-            return "Low"  
-        elif self.intrinsic_load < 0.7:  
-            return "Moderate"  
-        else:  
-            return "High"
-      
-    def to_dict(self) -> Dict[str, Any]:  
-        """Convert to dictionary representation."""  
-        return {  
-            'id': self.id,  
-            'topic_id': self.topic_id,  
-            'content_type': self.content_type.value,  
-            'difficulty': self.difficulty,  
-            'title': self.title,  
-            'description': self.description,  
-            'estimated_duration': self.estimated_duration,  
-            'intrinsic_load': self.intrinsic_load,  
-            'content_data': self.content_data,  
-            'interaction_count': self.interaction_count,  
-            'prerequisites': self.prerequisites,  
-            'learning_objectives': self.learning_objectives,  
-            'tags': self.tags,  
-            'created_at': self.created_at.isoformat() if self.created_at else None,  
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None  
-        }
+        return _COGNITIVE_LOAD_LABELS[  
+            bisect_right(_COGNITIVE_LOAD_THRESHOLDS, self.intrinsic_load)  
+        ]
       
     @classmethod  
-    def from_dict(cls, data: Dict[str, Any]) -> 'Content':  
-        """Create Content from dictionary."""  
+    def from_dict(cls, data: Dict[str, Any], validate: bool = True) -> 'Content':  
+        """  
+        Create Content from dictionary.
+          
+        Pass validate=False for trusted records (e.g. produced by to_dict)  
+        to skip __init__ and validation, see _fast_from_dict.  
+        """  
+        if not validate:  
+            return cls._fast_from_dict(data)
+          
         # Convert datetime strings  
         if 'created_at' in data and isinstance(data['created_at'], str):  
             data['created_at'] = datetime.fromisoformat(data['created_at'])  
@@ -123,12 +129,25 @@ class Content:
           
         # Convert content_type string to enum  
         if isinstance(data.get('content_type'), str):  
-            data['content_type'] = ContentType(data['content_type'])
+            data['content_type'] = _content_type_from_value(data['content_type'])
           
         return cls(**data)
+      
+    @classmethod  
+    def _fast_from_dict(cls, data: Dict[str, Any]) -> 'Content':  
+        """Rebuild trusted content without running __init__ or __post_init__."""  
+        content = fast_new(cls, data)  
+        if isinstance(content.content_type, str):  
+            content.content_type = _content_type_from_value(content.content_type)  
+        created_at = data.get('created_at')  
+        content.created_at = datetime.fromisoformat(created_at) if created_at else None  
+        updated_at = data.get('updated_at')  
+        content.updated_at = datetime.fromisoformat(updated_at) if updated_at else None  
+        return content
 
   
-@dataclass  
+@generate_to_dict  
+@dataclass(slots=True)  
 class Topic:  
     """  
     Represents a learning topic in the curriculum.
@@ -149,42 +168,49 @@ class Topic:
     learning_outcomes: List[str] = field(default_factory=list)  
     estimated_hours: float = 0.0
       
+    # (created_at, its ISO string) as of the last to_dict  
+    _iso_cache: Optional[Tuple] = field(default=None, init=False, repr=False, compare=False)
+      
     def __post_init__(self):  
         """Validate topic attributes."""  
-        if self.importance_weight <= 0:  
-            raise ValueError(f"Importance weight must be positive, got {self.importance_weight}")
+        if _VALIDATE:  
+            if self.importance_weight <= 0:  
+                raise ValueError(f"Importance weight must be positive, got {self.importance_weight}")
           
-        if not 0 <= self.difficulty <= 1:  
-            raise ValueError(f"Difficulty must be in [0, 1], got {self.difficulty}")
+            if not 0 <= self.difficulty <= 1:  
+                raise ValueError(f"Difficulty must be in [0, 1], got {self.difficulty}")
       
     def has_prerequisites(self) -> bool:  
         """Check if topic has prerequisites."""  
         return len(self.prerequisites) > 0
       
-    def to_dict(self) -> Dict[str, Any]:  
-        """Convert to dictionary representation."""  
-        return {  
-            'id': self.id,  
-            'name': self.name,  
-            'prerequisites': self.prerequisites,  
-            'importance_weight': self.importance_weight,  
-            'difficulty': self.difficulty,  
-            'description': self.description,  
-            'learning_outcomes': self.learning_outcomes,  
-            'estimated_hours': self.estimated_hours,  
-            'created_at': self.created_at.isoformat() if self.created_at else None  
-        }
-      
     @classmethod  
-    def from_dict(cls, data: Dict[str, Any]) -> 'Topic':  
-        """Create Topic from dictionary."""  
+    def from_dict(cls, data: Dict[str, Any], validate: bool = True) -> 'Topic':  
+        """  
+        Create Topic from dictionary.
+          
+        Pass validate=False for trusted records to skip __init__ and  
+        validation, see _fast_from_dict.  
+        """  
+        if not validate:  
+            return cls._fast_from_dict(data)
+          
         if 'created_at' in data and isinstance(data['created_at'], str):  
             data['created_at'] = datetime.fromisoformat(data['created_at'])
           
         return cls(**data)
+      
+    @classmethod  
+    def _fast_from_dict(cls, data: Dict[str, Any]) -> 'Topic':  
+        """Rebuild a trusted topic without running __init__ or __post_init__."""  
+        topic = fast_new(cls, data)  
+        created_at = data.get('created_at')  
+        topic.created_at = datetime.fromisoformat(created_at) if created_at else None  
+        return topic
 
   
-@dataclass  
+@generate_to_dict  
+@dataclass(slots=True)  
 class CaseStudy(Content):  
     """  
     Specialized content type for case-based learning.
@@ -200,23 +226,22 @@ class CaseStudy(Content):
       
     def __post_init__(self):  
         """Initialize case study with CASE_STUDY type."""  
-        super().__post_init__()  
-        self.content_type = ContentType.CASE_STUDY
-      
-    def to_dict(self) -> Dict[str, Any]:  
-        """Convert to dictionary with case-specific fields."""  
-        base_dict = super().to_dict()  
-        base_dict.update({  
-            'patient_presentation': self.patient_presentation,  
-            'clinical_questions': self.clinical_questions,  
-            'assessment_criteria': self.assessment_criteria,  
-            'learning_points': self.learning_points,  
-            'complexity_level': self.complexity_level  
-        })  
-        return base_dict
+        # Set before validation so the base class skips the string lookup.  
+        # Explicit super(): slots=True rebuilds the class, which breaks the  
+        # zero-argument form  
+        self.content_type = ContentType.CASE_STUDY  
+        super(CaseStudy, self).__post_init__()
+      
+    @classmethod  
+    def _fast_from_dict(cls, data: Dict[str, Any]) -> 'CaseStudy':  
+        """Rebuild a trusted case study, see Content._fast_from_dict."""  
+        case_study = super(CaseStudy, cls)._fast_from_dict(data)  
+        case_study.content_type = ContentType.CASE_STUDY  
+        return case_study
 
   
-@dataclass  
+@generate_to_dict  
+@dataclass(slots=True)  
 class Quiz(Content):  
     """  
     Specialized content type for assessments.
@@ -230,27 +255,92 @@ class Quiz(Content):
     randomize_questions: bool = False  
     show_feedback: bool = True
       
+    # Computed keys added by the generated to_dict  
+    _to_dict_extras = {'question_count': 'len(self.questions)'}
+      
     def __post_init__(self):  
         """Initialize quiz with QUIZ type."""  
-        super().__post_init__()  
-        self.content_type = ContentType.QUIZ
+        self.content_type = ContentType.QUIZ  
+        super(Quiz, self).__post_init__()
+      
+    @classmethod  
+    def _fast_from_dict(cls, data: Dict[str, Any]) -> 'Quiz':  
+        """Rebuild a trusted quiz, see Content._fast_from_dict."""  
+        quiz = super(Quiz, cls)._fast_from_dict(data)  
+        quiz.content_type = ContentType.QUIZ  
+        return quiz
       
     def get_question_count(self) -> int:  
         """Get number of questions in quiz."""  
         return len(self.questions)
+
+  
+class ContentCatalog:  
+    """  
+    Growable structure-of-arrays store of the content attributes read by  
+    the scoring function (Equation 5).
+      
+    Each added Content gets its row_index; the column properties return  
+    views over the filled rows so scoring can broadcast over the whole  
+    catalog. Columns are snapshotted on add, call sync after mutating a  
+    content's scoring attributes.  
+    """
+      
+    def __init__(self, capacity: int = 64):  
+        self.contents: List[Content] = []  
+        self._difficulty = np.empty(capacity, dtype=np.float32)  
+        self._intrinsic_load = np.empty(capacity, dtype=np.float32)  
+        self._interaction_count = np.empty(capacity, dtype=np.float32)  
+        self._content_type_code = np.empty(capacity, dtype=np.int8)
+      
+    def __len__(self) -> int:  
+        return len(self.contents)
       
-    def to_dict(self) -> Dict[str, Any]:  
-        """Convert to dictionary with quiz-specific fields."""  
-        base_dict = super().to_dict()  
-        base_dict.update({  
-            'questions': self.questions,  
-            'passing_score': self.passing_score,  
-            'time_limit': self.time_limit,  
-            'randomize_questions': self.randomize_questions,  
-            'show_feedback': self.show_feedback,  
-            'question_count': self.get_question_count()  
-        })  
-        return base_dict
+    @property  
+    def difficulty(self) -> np.ndarray:  
+        """dc of each row (Equation 7)."""  
+        return self._difficulty[:len(self.contents)]
+      
+    @property  
+    def intrinsic_load(self) -> np.ndarray:  
+        """Intrinsic load of each row (Equation 12)."""  
+        return self._intrinsic_load[:len(self.contents)]
+      
+    @property  
+    def interaction_count(self) -> np.ndarray:  
+        """Nc of each row (Equation 15)."""  
+        return self._interaction_count[:len(self.contents)]
+      
+    @property  
+    def content_type_code(self) -> np.ndarray:  
+        """ContentType.idx of each row."""  
+        return self._content_type_code[:len(self.contents)]
+      
+    def add(self, content: Content) -> int:  
+        """Append content as a new row and return its row index."""  
+        row = len(self.contents)  
+        if row == len(self._difficulty):  
+            capacity = max(64, 2 * row)  
+            for name in ('_difficulty', '_intrinsic_load',  
+                         '_interaction_count', '_content_type_code'):  
+                column = getattr(self, name)  
+                grown = np.empty(capacity, dtype=column.dtype)  
+                grown[:row] = column  
+                setattr(self, name, grown)  
+        self.contents.append(content)  
+        content.row_index = row  
+        self.sync(content)  
+        return row
+      
+    def sync(self, content: Content) -> None:  
+        """Copy a content's scoring attributes into its row."""  
+        row = content.row_index  
+        if not (0 <= row < len(self.contents) and self.contents[row] is content):  
+            raise ValueError(f"Content {content.id} is not a row of this catalog")  
+        self._difficulty[row] = content.difficulty  
+        self._intrinsic_load[row] = content.intrinsic_load  
+        self._interaction_count[row] = content.interaction_count  
+        self._content_type_code[row] = content.content_type.idx
 
   
 # Content factory functions  
@@ -261,10 +351,11 @@ def create_video_content(
     difficulty: float,  
     duration: int,  
     video_url: str,  
+    catalog: Optional[ContentCatalog] = None,  
     **kwargs  
 ) -> Content:  
-    """Factory function for creating video content."""  
-    return Content(  
+    """Factory function for creating video content (added to catalog if given)."""  
+    content = Content(  
         id=content_id,  
         topic_id=topic_id,  
         content_type=ContentType.VIDEO,  
@@ -273,7 +364,10 @@ def create_video_content(
         estimated_duration=duration,  
         content_data={'video_url': video_url, **kwargs},  
         **kwargs  
-    )
+    )  
+    if catalog is not None:  
+        catalog.add(content)  
+    return content
 
   
 def create_text_content(  
@@ -282,14 +376,22 @@ def create_text_content(
     title: str,  
     difficulty: float,  
     text_body: str,  
+    word_count: Optional[int] = None,  
+    catalog: Optional[ContentCatalog] = None,  
     **kwargs  
 ) -> Content:  
-    """Factory function for creating text content."""  
+    """  
+    Factory function for creating text content (added to catalog if given).
+      
+    Pass word_count when it is already known to skip splitting text_body.  
+    """  
+    if word_count is None:  
+        word_count = len(text_body.split())
+      
     # Estimate reading time (200 words per minute)  
-    word_count = len(text_body.split())  
     duration = max(1, word_count // 200)
       
-    return Content(  
+    content = Content(  
         id=content_id,  
         topic_id=topic_id,  
         content_type=ContentType.TEXT,  
@@ -298,7 +400,10 @@ def create_text_content(
         estimated_duration=duration,  
         content_data={'text_body': text_body, 'word_count': word_count},  
         **kwargs  
-    )
+    )  
+    if catalog is not None:  
+        catalog.add(content)  
+    return content
 
   
 def create_interactive_content(  
@@ -307,10 +412,11 @@ def create_interactive_content(
     title: str,  
     difficulty: float,  
     interaction_type: str,  
+    catalog: Optional[ContentCatalog] = None,  
     **kwargs  
 ) -> Content:  
-    """Factory function for creating interactive content."""  
-    return Content(  
+    """Factory function for creating interactive content (added to catalog if given)."""  
+    content = Content(  
         id=content_id,  
         topic_id=topic_id,  
         content_type=ContentType.INTERACTIVE,  
@@ -318,4 +424,7 @@ def create_interactive_content(
         title=title,  
         content_data={'interaction_type': interaction_type},  
         **kwargs  
-    )  
\ No newline at end of file
+    )  
+    if catalog is not None:  
+        catalog.add(content)  
+    return content  
\ No newline at end of file
@@ -0,0 +1,132 @@
+"""  
+Generated fast paths for dataclass records: rebuilding them from trusted  
+dicts and converting them back to dicts.  
+"""  
+import os  
+from dataclasses import MISSING, fields  
+from datetime import datetime  
+from enum import Enum  
+from typing import Any, Callable, Dict, Optional, get_args, get_origin
+  
+# Range checks in model __post_init__; ADAPTIVE_VALIDATE=0 skips them for  
+# bulk ingestion of data that was validated upstream  
+_VALIDATE = os.environ.get("ADAPTIVE_VALIDATE", "1") == "1"
+  
+# Dataclass -> generated fill(obj, data) function  
+_FILLERS: Dict[type, Callable[[Any, Dict[str, Any]], Any]] = {}
+
+  
+def _compile_filler(cls) -> Callable[[Any, Dict[str, Any]], Any]:  
+    """  
+    Generate a function assigning every field of cls from a dict.
+      
+    One straight-line attribute store per field, the same way dataclass  
+    generates __init__, so it works for slotted and dict-backed classes.  
+    """  
+    env: Dict[str, Any] = {}  
+    lines = []  
+    for f in fields(cls):  
+        default_name, factory_name = f'_default_{f.name}', f'_factory_{f.name}'  
+        if f.default is not MISSING:  
+            env[default_name] = f.default  
+        if f.default_factory is not MISSING:  
+            env[factory_name] = f.default_factory
+  
+        if f.init and f.default is not MISSING:  
+            value = f'data.get({f.name!r}, {default_name})'  
+        elif f.init and f.default_factory is not MISSING:  
+            value = f'data[{f.name!r}] if {f.name!r} in data else {factory_name}()'  
+        elif f.init:  
+            value = f'data[{f.name!r}]'  
+        elif f.default is not MISSING:  
+            value = default_name  
+        elif f.default_factory is not MISSING:  
+            value = f'{factory_name}()'  
+        else:  
+            continue  
+        lines.append(f'    obj.{f.name} = {value}')
+      
+    source = 'def fill(obj, data):\n' + '\n'.join(lines) + '\n    return obj\n'  
+    exec(source, env)  
+    return env['fill']
+
+  
+def fast_new(cls, data: Dict[str, Any]):  
+    """  
+    Allocate cls and fill its fields from data without calling __init__.
+      
+    Skips keyword parsing and __post_init__ validation, so data must come  
+    from a trusted source such as the class's own to_dict. Missing fields  
+    take their defaults (as do init=False fields), unknown keys are ignored  
+    and a missing required field raises KeyError. Values are stored as  
+    given; callers convert enum and datetime fields afterwards.  
+    """  
+    fill = _FILLERS.get(cls)  
+    if fill is None:  
+        fill = _FILLERS[cls] = _compile_filler(cls)  
+    return fill(object.__new__(cls), data)
+
+  
+def _isoformat(value: Optional[datetime]) -> Optional[str]:  
+    return value.isoformat() if value else None
+
+  
+def _is_enum(tp) -> bool:  
+    return isinstance(tp, type) and issubclass(tp, Enum)
+
+  
+def _field_expression(name: str, tp) -> str:  
+    """Dict value expression for a field, by its annotated type."""  
+    if _is_enum(tp):  
+        return f'self.{name}.value'  
+    if get_origin(tp) is dict and _is_enum((get_args(tp) or (None,))[0]):  
+        return f'{{k.value: v for k, v in self.{name}.items()}}'  
+    if callable(getattr(tp, 'to_list', None)):  
+        return f'self.{name}.to_list()'  
+    return f'self.{name}'
+
+  
+def generate_to_dict(cls):  
+    """  
+    Class decorator generating cls.to_dict from its dataclass fields.
+      
+    Emits one dict literal with a key per init field, in declaration  
+    order: enums as their value, enum-keyed dicts with value keys, ring  
+    buffers as lists and datetimes as ISO strings. If the class has an  
+    _iso_cache field the ISO strings are reused until a datetime field is  
+    reassigned. Extra computed keys come from a _to_dict_extras mapping  
+    of key -> expression over self. Apply above @dataclass.  
+    """  
+    init_fields = [f for f in fields(cls) if f.init]  
+    dt_names = [f.name for f in init_fields if f.type in (datetime, Optional[datetime])]  
+    cached = bool(dt_names) and any(f.name == '_iso_cache' for f in fields(cls))
+      
+    lines = ['def to_dict(self):']  
+    if cached:  
+        stale = ' or '.join(f'cached[{i}] is not self.{n}' for i, n in enumerate(dt_names))  
+        lines += [  
+            '    cached = self._iso_cache',  
+            f'    if cached is None or {stale}:',  
+            '        cached = self._iso_cache = ('  
+            + ''.join(f'self.{n}, ' for n in dt_names)  
+            + ''.join(f'_isoformat(self.{n}), ' for n in dt_names) + ')',  
+        ]  
+    items = []  
+    for f in init_fields:  
+        if f.name in dt_names:  
+            value = (f'cached[{len(dt_names) + dt_names.index(f.name)}]' if cached  
+                     else f'_isoformat(self.{f.name})')  
+        else:  
+            value = _field_expression(f.name, f.type)  
+        items.append(f'{f.name!r}: {value}')  
+    for key, expression in getattr(cls, '_to_dict_extras', {}).items():  
+        items.append(f'{key!r}: {expression}')  
+    lines.append('    return {' + ', '.join(items) + '}')
+      
+    env = {'_isoformat': _isoformat}  
+    exec('\n'.join(lines) + '\n', env)  
+    to_dict = env['to_dict']  
+    to_dict.__qualname__ = f'{cls.__qualname__}.to_dict'  
+    to_dict.__doc__ = 'Convert to dictionary representation.'  
+    cls.to_dict = to_dict  
+    return cls
@@ -1,11 +1,29 @@
 """Data models and schemas."""  
 from dataclasses import dataclass, field  
-from typing import List, Dict, Optional  
+from typing import List, Dict, Optional, Tuple  
 from enum import Enum  
-from datetime import datetime
+from datetime import datetime  
+import numpy as np  
+from .buffers import RingBuffer
 
   
-class LearningStyle(Enum):  
+# Number of recent performance/engagement scores kept per student  
+HISTORY_WINDOW = 20
+
+  
+class IndexedEnum(Enum):  
+    """  
+    Enum whose members carry idx, their position in declaration order.
+      
+    Lets members be used directly as array indices (rows and columns of  
+    the style-affinity matrix) while keeping their string values.  
+    """
+      
+    def __init__(self, value):  
+        self.idx = len(type(self).__members__)
+
+  
+class LearningStyle(IndexedEnum):  
     """Learning style preferences."""  
     VISUAL = "visual"  
     AUDITORY = "auditory"  
@@ -13,7 +31,7 @@ class LearningStyle(Enum):
     READING_WRITING = "reading_writing"
 
   
-class ContentType(Enum):  
+class ContentType(IndexedEnum):  
     """Types of learning content."""  
     VIDEO = "video"  
     TEXT = "text"  
@@ -22,7 +40,7 @@ class ContentType(Enum):
     CASE_STUDY = "case_study"
 
   
-@dataclass  
+@dataclass(slots=True)  
 class Topic:  
     """Represents a learning topic."""  
     id: str  
@@ -33,7 +51,7 @@ class Topic:
     created_at: Optional[datetime] = None
 
   
-@dataclass  
+@dataclass(slots=True)  
 class Content:  
     """Represents learning content."""  
     id: str  
@@ -49,22 +67,60 @@ class Content:
     created_at: Optional[datetime] = None
 
   
-@dataclass  
+@dataclass(slots=True)  
 class StudentState:  
     """Represents student state."""  
     student_id: str  
     knowledge_state: Dict[str, float] = field(default_factory=dict)  
     learning_style_preferences: Dict[LearningStyle, float] = field(default_factory=dict)  
     current_cognitive_load: float = 0.0  
-    recent_performance: List[float] = field(default_factory=list)  
+    recent_performance: RingBuffer = field(default_factory=lambda: RingBuffer(HISTORY_WINDOW))  
     mastered_topics: List[str] = field(default_factory=list)  
     total_interactions: int = 0  
-    engagement_history: List[float] = field(default_factory=list)  
+    engagement_history: RingBuffer = field(default_factory=lambda: RingBuffer(HISTORY_WINDOW))  
     created_at: Optional[datetime] = None  
     updated_at: Optional[datetime] = None
+      
+    # (preferences dict, normalized P(style | st) in LearningStyle order) of  
+    # the last lookup  
+    _style_pref_vec: Optional[Tuple[Dict, Optional[np.ndarray]]] = field(  
+        default=None, init=False, repr=False, compare=False  
+    )
+      
+    def __post_init__(self):  
+        """Keep the last HISTORY_WINDOW entries of list-valued histories."""  
+        if not isinstance(self.recent_performance, RingBuffer):  
+            self.recent_performance = RingBuffer(HISTORY_WINDOW, self.recent_performance)  
+        if not isinstance(self.engagement_history, RingBuffer):  
+            self.engagement_history = RingBuffer(HISTORY_WINDOW, self.engagement_history)
+      
+    def get_style_pref_vec(self) -> Optional[np.ndarray]:  
+        """  
+        Learning style preferences as a vector summing to 1 (None if unset).
+          
+        Cached per preferences dict, so assigning a new dict is picked up;  
+        call invalidate_caches after editing the dict in place.  
+        """  
+        prefs = self.learning_style_preferences  
+        cached = self._style_pref_vec  
+        if cached is None or cached[0] is not prefs:  
+            vec = None  
+            if prefs:  
+                vec = np.zeros(len(LearningStyle), dtype=np.float32)  
+                for style, preference in prefs.items():  
+                    if isinstance(style, LearningStyle):  
+                        vec[style.idx] = preference  
+                total = vec.sum()  
+                vec = vec / total if total > 0 else None  
+            cached = self._style_pref_vec = (prefs, vec)  
+        return cached[1]
+      
+    def invalidate_caches(self) -> None:  
+        """Drop the cached style vector after editing learning_style_preferences in place."""  
+        self._style_pref_vec = None
 
   
-@dataclass  
+@dataclass(slots=True)  
 class Observation:  
     """Represents a learning interaction observation."""  
     content_id: str  
@@ -76,7 +132,7 @@ class Observation:
     metadata: Dict = field(default_factory=dict)
 
   
-@dataclass  
+@dataclass(slots=True)  
 class Recommendation:  
     """Represents a content recommendation."""  
     student_id: str  
@@ -9,13 +9,21 @@ Based on the paper's student model (st) which includes:
 """
   
 from dataclasses import dataclass, field  
-from typing import Dict, List, Optional  
+from typing import Dict, List, Optional, Tuple  
 from datetime import datetime  
-from enum import Enum  
-import numpy as np
+from itertools import repeat  
+import numpy as np  
+from .buffers import RingBuffer  
+from .schemas import IndexedEnum  
+from .fastpath import _VALIDATE, fast_new, generate_to_dict
 
   
-class LearningStyle(Enum):  
+# Number of recent performance/engagement scores kept per student; longer  
+# than schemas.HISTORY_WINDOW, which the scoring model uses  
+EXTENDED_HISTORY_WINDOW = 50
+
+  
+class LearningStyle(IndexedEnum):  
     """  
     Learning style preferences based on VARK model.
       
@@ -28,7 +36,18 @@ class LearningStyle(Enum):
     READING_WRITING = "reading_writing"
 
   
-@dataclass  
+# Value -> member, avoids the Enum constructor when deserializing  
+_LEARNING_STYLE_BY_VALUE = {member.value: member for member in LearningStyle}
+
+  
+def _learning_style_from_value(value: str) -> LearningStyle:  
+    """Look up a LearningStyle by value (the constructor raises for unknown values)."""  
+    member = _LEARNING_STYLE_BY_VALUE.get(value)  
+    return member if member is not None else LearningStyle(value)
+
+  
+@generate_to_dict  
+@dataclass(slots=True)  
 class StudentState:  
     """  
     Represents the current state of a student (st in the paper).
@@ -41,10 +60,10 @@ class StudentState:
         knowledge_state: P(mastery_topic) for each topic (Equation 8)  
         learning_style_preferences: P(style_j | st) for each style (Equation 6)  
         current_cognitive_load: L_current for CL calculation (Equation 12)  
-        recent_performance: Recent correctness for engagement (Equation 14)  
+        recent_performance: Last EXTENDED_HISTORY_WINDOW correctness scores (Equation 14)  
         mastered_topics: Topics with P(mastery) >= threshold  
         total_interactions: Nt in exploration bonus (Equation 15)  
-        engagement_history: Historical engagement scores  
+        engagement_history: Last EXTENDED_HISTORY_WINDOW engagement scores  
     """
       
     student_id: str
@@ -62,14 +81,19 @@ class StudentState:
     current_cognitive_load: float = 0.0
       
     # Performance tracking  
-    recent_performance: List[float] = field(default_factory=list)  
+    # Ndarray-backed so kernels can read it as contiguous float64  
+    recent_performance: RingBuffer = field(  
+        default_factory=lambda: RingBuffer(EXTENDED_HISTORY_WINDOW, dtype=np.float64)  
+    )  
     mastered_topics: List[str] = field(default_factory=list)
       
     # Interaction tracking  
     total_interactions: int = 0  # Nt in Equation 15
       
     # Engagement tracking  
-    engagement_history: List[float] = field(default_factory=list)
+    engagement_history: RingBuffer = field(  
+        default_factory=lambda: RingBuffer(EXTENDED_HISTORY_WINDOW, dtype=np.float64)  
+    )
       
     # Timestamps  
     created_at: Optional[datetime] = None  
@@ -78,23 +102,45 @@ class StudentState:
     # Additional metadata  
     metadata: Dict = field(default_factory=dict)
       
+    # (created_at, updated_at, their ISO strings) as of the last to_dict  
+    _iso_cache: Optional[Tuple] = field(  
+        default=None, init=False, repr=False, compare=False  
+    )  
+    # (preferences dict, its normalized float32 vector), built lazily  
+    _style_pref_vec: Optional[Tuple[Dict, Optional[np.ndarray]]] = field(  
+        default=None, init=False, repr=False, compare=False  
+    )
+      
     def __post_init__(self):  
         """Validate student state."""  
-        # Validate learning style preferences sum to 1.0  
-        if self.learning_style_preferences:  
-            total = sum(self.learning_style_preferences.values())  
-            if abs(total - 1.0) > 0.01:  
-                raise ValueError(  
-                    f"Learning style preferences must sum to 1.0, got {total}"  
-                )  
-        else:  
+        # Keep the last EXTENDED_HISTORY_WINDOW entries of list-valued histories  
+        if not isinstance(self.recent_performance, RingBuffer):  
+            self.recent_performance = RingBuffer(  
+                EXTENDED_HISTORY_WINDOW, self.recent_performance, dtype=np.float64  
+            )  
+        if not isinstance(self.engagement_history, RingBuffer):  
+            self.engagement_history = RingBuffer(  
+                EXTENDED_HISTORY_WINDOW, self.engagement_history, dtype=np.float64  
+            )
+          
+        if not self.learning_style_preferences:  
             # Initialize with uniform distribution  
             self.learning_style_preferences = {  
                 LearningStyle.VISUAL: 0.25,  
                 LearningStyle.AUDITORY: 0.25,  
                 LearningStyle.KINESTHETIC: 0.25,  
                 LearningStyle.READING_WRITING: 0.25  
-            }
+            }  
+        elif _VALIDATE:  
+            # Validate learning style preferences sum to 1.0  
+            total = sum(self.learning_style_preferences.values())  
+            if abs(total - 1.0) > 0.01:  
+                raise ValueError(  
+                    f"Learning style preferences must sum to 1.0, got {total}"  
+                )
+          
+        if not _VALIDATE:  
+            return
           
         # Validate cognitive load  
         if not 0 <= self.current_cognitive_load <= 1:  
@@ -119,6 +165,10 @@ class StudentState:
         Implements Equation (8):  
         K(st) = Σ wj · P(mastery_j)
           
+        Evaluated as a dot product of the weights and the matching  
+        masteries, both packed from the dicts on every call, so edits to  
+        either dict are always seen.
+          
         Args:  
             topic_weights: Importance weight for each topic
           
@@ -128,13 +178,42 @@ class StudentState:
         if not self.knowledge_state:  
             return 0.0
           
-        weighted_sum = sum(  
-            self.knowledge_state.get(topic, 0.0) * weight  
-            for topic, weight in topic_weights.items()  
+        n_topics = len(topic_weights)  
+        weights = np.fromiter(topic_weights.values(), dtype=np.float64, count=n_topics)  
+        total_weight = float(weights.sum())  
+        if total_weight <= 0:  
+            return 0.0  
+        mastery = np.fromiter(  
+            map(self.knowledge_state.get, topic_weights, repeat(0.0)),  
+            dtype=np.float64, count=n_topics  
         )  
-        total_weight = sum(topic_weights.values())
+        return float(weights @ mastery) / total_weight
+      
+    def get_style_pref_vec(self) -> Optional[np.ndarray]:  
+        """  
+        Learning style preferences as a vector summing to 1 (None if unset).
           
-        return weighted_sum / total_weight if total_weight > 0 else 0.0
+        Vector is in LearningStyle.idx order, so LS(c,st) (Equation 6) is a  
+        single product with the style-affinity matrix. Cached per  
+        preferences dict, so assigning a new dict is picked up; call  
+        invalidate_caches after editing the dict in place.  
+        """  
+        prefs = self.learning_style_preferences  
+        cached = self._style_pref_vec  
+        if cached is None or cached[0] is not prefs:  
+            vec = None  
+            if prefs:  
+                vec = np.zeros(len(LearningStyle), dtype=np.float32)  
+                for style, preference in prefs.items():  
+                    vec[style.idx] = preference  
+                total = vec.sum()  
+                vec = vec / total if total > 0 else None  
+            cached = self._style_pref_vec = (prefs, vec)  
+        return cached[1]
+      
+    def invalidate_caches(self) -> None:  
+        """Drop the cached style vector after editing learning_style_preferences in place."""  
+        self._style_pref_vec = None
       
     def get_topic_mastery(self, topic_id: str) -> float:  
         """Get mastery probability for a specific topic."""  
@@ -146,19 +225,11 @@ class StudentState:
       
     def get_average_performance(self, window: int = 10) -> float:  
         """Get average performance over recent window."""  
-        if not self.recent_performance:  
-            return 0.5
-          
-        recent = self.recent_performance[-window:]  
-        return np.mean(recent)
+        return self.recent_performance.mean_last(window, default=0.5)
       
     def get_average_engagement(self, window: int = 10) -> float:  
         """Get average engagement over recent window."""  
-        if not self.engagement_history:  
-            return 0.5
-          
-        recent = self.engagement_history[-window:]  
-        return np.mean(recent)
+        return self.engagement_history.mean_last(window, default=0.5)
       
     def get_learning_velocity(self) -> float:  
         """  
@@ -167,14 +238,18 @@ class StudentState:
         Returns:  
             Slope of performance trend (positive = improving)  
         """  
-        if len(self.recent_performance) < 2:  
+        n = len(self.recent_performance)  
+        if n < 2:  
             return 0.0
           
-        x = np.arange(len(self.recent_performance))  
-        y = np.array(self.recent_performance)
-          
-        # Linear regression slope  
-        slope = np.polyfit(x, y, 1)[0]
+        # Least-squares slope against x = 0..n-1, with Σx and Σx² in closed form:  
+        # (n·Σxy - Σx·Σy) / (n·Σx² - (Σx)²)  
+        sum_x = n * (n - 1) / 2  
+        sum_x2 = (n - 1) * n * (2 * n - 1) / 6  
+        values = self.recent_performance.to_list()  
+        sum_y = sum(values)  
+        sum_xy = sum(i * y for i, y in enumerate(values))  
+        slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
           
         return float(slope)
       
@@ -183,10 +258,14 @@ class StudentState:
         if not self.learning_style_preferences:  
             return LearningStyle.VISUAL
           
-        return max(  
-            self.learning_style_preferences.items(),  
-            key=lambda x: x[1]  
-        )[0]
+        # Plain loop instead of max(key=...): no lambda call per style;  
+        # ties still go to the first style  
+        items = iter(self.learning_style_preferences.items())  
+        dominant, best = next(items)  
+        for style, preference in items:  
+            if preference > best:  
+                dominant, best = style, preference  
+        return dominant
       
     def update_cognitive_load(  
         self,  
@@ -202,37 +281,26 @@ class StudentState:
             new_load: New cognitive load from content  
             decay_factor: Decay rate for previous load  
         """  
-        self.current_cognitive_load = (  
+        self.current_cognitive_load = min(1.0, max(0.0, (  
             decay_factor * self.current_cognitive_load +  
             (1 - decay_factor) * new_load  
-        )  
-        self.current_cognitive_load = np.clip(self.current_cognitive_load, 0.0, 1.0)
-      
-    def to_dict(self) -> Dict:  
-        """Convert to dictionary representation."""  
-        return {  
-            'student_id': self.student_id,  
-            'knowledge_state': self.knowledge_state,  
-            'learning_style_preferences': {  
-                k.value: v for k, v in self.learning_style_preferences.items()  
-            },  
-            'current_cognitive_load': self.current_cognitive_load,  
-            'recent_performance': self.recent_performance,  
-            'mastered_topics': self.mastered_topics,  
-            'total_interactions': self.total_interactions,  
-            'engagement_history': self.engagement_history,  
-            'created_at': self.created_at.isoformat() if self.created_at else None,  
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,  
-            'metadata': self.metadata  
-        }
+        )))
       
     @classmethod  
-    def from_dict(cls, data: Dict) -> 'StudentState':  
-        """Create StudentState from dictionary."""  
+    def from_dict(cls, data: Dict, validate: bool = True) -> 'StudentState':  
+        """  
+        Create StudentState from dictionary.
+          
+        Pass validate=False for trusted records (e.g. produced by to_dict)  
+        to skip __init__ and validation, see _fast_from_dict.  
+        """  
+        if not validate:  
+            return cls._fast_from_dict(data)
+          
         # Convert learning style strings to enums  
         if 'learning_style_preferences' in data:  
             data['learning_style_preferences'] = {  
-                LearningStyle(k): v  
+                _learning_style_from_value(k): v  
                 for k, v in data['learning_style_preferences'].items()  
             }
           
@@ -243,9 +311,30 @@ class StudentState:
             data['updated_at'] = datetime.fromisoformat(data['updated_at'])
           
         return cls(**data)
+      
+    @classmethod  
+    def _fast_from_dict(cls, data: Dict) -> 'StudentState':  
+        """Rebuild a trusted student without running __init__ or __post_init__."""  
+        student = fast_new(cls, data)  
+        student.recent_performance = RingBuffer(  
+            EXTENDED_HISTORY_WINDOW, student.recent_performance, dtype=np.float64  
+        )  
+        student.engagement_history = RingBuffer(  
+            EXTENDED_HISTORY_WINDOW, student.engagement_history, dtype=np.float64  
+        )  
+        student.learning_style_preferences = {  
+            _learning_style_from_value(k) if isinstance(k, str) else k: v  
+            for k, v in student.learning_style_preferences.items()  
+        }  
+        created_at = data.get('created_at')  
+        student.created_at = datetime.fromisoformat(created_at) if created_at else None  
+        updated_at = data.get('updated_at')  
+        student.updated_at = datetime.fromisoformat(updated_at) if updated_at else None  
+        return student
 
   
-@dataclass  
+@generate_to_dict  
+@dataclass(slots=True)  
 class Observation:  
     """  
     Represents an observation from student interaction (ot in the paper).
@@ -266,24 +355,38 @@ class Observation:
       
     def __post_init__(self):  
         """Validate observation."""  
-        if not 0 <= self.engagement_score <= 1:  
-            raise ValueError(  
-                f"Engagement score must be in [0, 1], got {self.engagement_score}"  
-            )
+        if _VALIDATE:  
+            if not 0 <= self.engagement_score <= 1:  
+                raise ValueError(  
+                    f"Engagement score must be in [0, 1], got {self.engagement_score}"  
+                )
           
-        if self.time_spent < 0:  
-            raise ValueError(  
-                f"Time spent must be non-negative, got {self.time_spent}"  
-            )
+            if self.time_spent < 0:  
+                raise ValueError(  
+                    f"Time spent must be non-negative, got {self.time_spent}"  
+                )
       
-    def to_dict(self) -> Dict:  
-        """Convert to dictionary representation."""  
-        return {  
-            'content_id': self.content_id,  
-            'topic_id': self.topic_id,  
-            'correct': self.correct,  
-            'time_spent': self.time_spent,  
-            'engagement_score': self.engagement_score,  
-            'timestamp': self.timestamp.isoformat(),  
-            'metadata': self.metadata  
-        }  
\ No newline at end of file
+    @classmethod  
+    def from_dict(cls, data: Dict, validate: bool = True) -> 'Observation':  
+        """  
+        Create Observation from dictionary.
+          
+        Pass validate=False for trusted records (e.g. produced by to_dict)  
+        to skip __init__ and validation, see _fast_from_dict.  
+        """  
+        if not validate:  
+            return cls._fast_from_dict(data)
+          
+        if 'timestamp' in data and isinstance(data['timestamp'], str):  
+            data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+          
+        return cls(**data)
+      
+    @classmethod  
+    def _fast_from_dict(cls, data: Dict) -> 'Observation':  
+        """Rebuild a trusted observation without running __init__ or __post_init__."""  
+        observation = fast_new(cls, data)  
+        timestamp = data.get('timestamp')  
+        if timestamp:  
+            observation.timestamp = datetime.fromisoformat(timestamp)  
+        return observation  
\ No newline at end of file
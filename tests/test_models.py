@@ -0,0 +1,119 @@
+"""Serialization round-trips and history buffers of the model classes."""  
+import unittest  
+from datetime import datetime
+  
+from adaptive_algorithm.models.buffers import RingBuffer  
+from adaptive_algorithm.models.content import CaseStudy, Content, ContentType, Quiz, Topic  
+from adaptive_algorithm.models.student import LearningStyle, Observation, StudentState
+
+  
+CREATED_AT = datetime(2024, 1, 2, 3, 4, 5)
+
+  
+class RoundTripTest(unittest.TestCase):  
+    """from_dict(to_dict()) must rebuild an equal object on both paths."""
+      
+    def assert_round_trip(self, obj):  
+        cls = type(obj)  
+        for validate in (True, False):  
+            with self.subTest(cls=cls.__name__, validate=validate):  
+                data = obj.to_dict()  
+                # Computed keys (e.g. Quiz.question_count) are not constructor arguments  
+                for key in getattr(cls, '_to_dict_extras', {}):  
+                    del data[key]  
+                rebuilt = cls.from_dict(data, validate=validate)  
+                self.assertIs(type(rebuilt), cls)  
+                self.assertEqual(rebuilt, obj)  
+                self.assertEqual(rebuilt.to_dict(), obj.to_dict())
+      
+    def test_content(self):  
+        self.assert_round_trip(Content(  
+            id="c1", topic_id="t1", content_type=ContentType.VIDEO, difficulty=0.35,  
+            title="Intro", description="Video intro", estimated_duration=12,  
+            intrinsic_load=0.4, interaction_count=3, created_at=CREATED_AT,  
+            prerequisites=["t0"], tags=["intro"]  
+        ))
+      
+    def test_quiz(self):  
+        self.assert_round_trip(Quiz(  
+            id="q1", topic_id="t1", content_type=ContentType.QUIZ, difficulty=0.7,  
+            title="Check", description="Quiz", estimated_duration=10,  
+            questions=[{"prompt": "2 + 2", "answer": 4}], time_limit=15,  
+            updated_at=CREATED_AT  
+        ))
+      
+    def test_case_study(self):  
+        self.assert_round_trip(CaseStudy(  
+            id="cs1", topic_id="t2", content_type=ContentType.CASE_STUDY, difficulty=0.6,  
+            title="Case", description="Case study", estimated_duration=30,  
+            patient_presentation="Fever", learning_points=["Triage"],  
+            complexity_level="complex"  
+        ))
+      
+    def test_topic(self):  
+        self.assert_round_trip(Topic(  
+            id="t1", name="Topic", prerequisites=["t0"], created_at=CREATED_AT  
+        ))
+      
+    def test_student_state(self):  
+        self.assert_round_trip(StudentState(  
+            student_id="s1", knowledge_state={"t1": 0.4, "t2": 0.9},  
+            learning_style_preferences={  
+                LearningStyle.VISUAL: 0.5, LearningStyle.AUDITORY: 0.1,  
+                LearningStyle.KINESTHETIC: 0.3, LearningStyle.READING_WRITING: 0.1  
+            },  
+            mastered_topics=["t2"], recent_performance=[1.0, 0.0, 1.0],  
+            engagement_history=[0.6, 0.8], total_interactions=3,  
+            created_at=CREATED_AT, metadata={"cohort": "a"}  
+        ))
+      
+    def test_observation(self):  
+        self.assert_round_trip(Observation(  
+            content_id="c1", topic_id="t1", correct=True, time_spent=42,  
+            engagement_score=0.75, timestamp=CREATED_AT  
+        ))
+
+  
+class ContentLabelTest(unittest.TestCase):
+      
+    def test_labels_follow_attribute_changes(self):  
+        content = Content(  
+            id="c1", topic_id="t1", content_type=ContentType.TEXT, difficulty=0.3,  
+            title="Notes", description="Text", estimated_duration=5, intrinsic_load=0.7  
+        )  
+        self.assertEqual(content.get_difficulty_label(), "Moderate")  
+        self.assertEqual(content.get_cognitive_load_label(), "High")  
+        content.difficulty = 0.85  
+        content.intrinsic_load = 0.1  
+        self.assertEqual(content.get_difficulty_label(), "Advanced")  
+        self.assertEqual(content.get_cognitive_load_label(), "Low")
+
+  
+class RingBufferTest(unittest.TestCase):
+      
+    def test_wrap_around_keeps_most_recent(self):  
+        buf = RingBuffer(3, [1.0, 2.0])  
+        buf.extend([3.0, 4.0, 5.0])  
+        self.assertEqual(len(buf), 3)  
+        self.assertEqual(buf.to_list(), [3.0, 4.0, 5.0])  
+        self.assertEqual(buf.to_array().tolist(), [3.0, 4.0, 5.0])  
+        self.assertEqual(buf[0], 3.0)  
+        self.assertEqual(buf[-1], 5.0)  
+        self.assertEqual(buf[1:], [4.0, 5.0])  
+        self.assertEqual(list(buf), [3.0, 4.0, 5.0])
+      
+    def test_mean_last(self):  
+        buf = RingBuffer(4)  
+        self.assertEqual(buf.mean_last(3), 0.5)  
+        buf.extend([0.0, 1.0, 1.0, 0.0, 1.0])  
+        self.assertAlmostEqual(buf.mean_last(3), 2.0 / 3.0)  
+        self.assertAlmostEqual(buf.mean_last(10), 3.0 / 4.0)
+      
+    def test_index_out_of_range(self):  
+        buf = RingBuffer(2, [1.0])  
+        with self.assertRaises(IndexError):  
+            buf[1]
+
+  
+if __name__ == '__main__':  
+    unittest.main()
@@ -0,0 +1,162 @@
+"""Agreement between the scalar, batched and fused catalog scorers."""  
+import random  
+import unittest  
+from unittest import mock
+  
+import numpy as np
+  
+from adaptive_algorithm.core import AdaptiveLearningAlgorithm  
+from adaptive_algorithm.core import algorithm as algorithm_module  
+from adaptive_algorithm.core import scoring as scoring_module  
+from adaptive_algorithm.models.schemas import (  
+    Content, ContentType, LearningStyle, Observation, StudentState, Topic  
+)
+
+  
+def make_fixture(seed: int = 0, n_contents: int = 200, n_topics: int = 10):  
+    """Random topics, catalog and student with unrounded attributes."""  
+    rng = random.Random(seed)  
+    topics = {  
+        f"t{i}": Topic(  
+            id=f"t{i}", name=f"Topic {i}",  
+            prerequisites=[f"t{j}" for j in range(i) if rng.random() < 0.2],  
+            importance_weight=rng.uniform(0.5, 2.0)  
+        )  
+        for i in range(n_topics)  
+    }  
+    content_types = list(ContentType)  
+    contents = [  
+        Content(  
+            id=f"c{k}", topic_id=f"t{rng.randrange(n_topics)}",  
+            content_type=content_types[rng.randrange(len(content_types))],  
+            difficulty=rng.random(), title="", description="", estimated_duration=5,  
+            intrinsic_load=rng.random(), interaction_count=rng.randrange(5)  
+        )  
+        for k in range(n_contents)  
+    ]  
+    student = StudentState(  
+        student_id="s",  
+        knowledge_state={f"t{i}": rng.random() for i in range(n_topics) if rng.random() < 0.7},  
+        learning_style_preferences={style: rng.random() for style in LearningStyle},  
+        current_cognitive_load=rng.random(),  
+        total_interactions=rng.randrange(50)  
+    )  
+    student.recent_performance.extend(float(rng.random() < 0.6) for _ in range(8))  
+    student.engagement_history.extend(rng.random() for _ in range(8))  
+    return topics, contents, student
+
+  
+class ScorerAgreementTest(unittest.TestCase):  
+    """_calculate_score, _calculate_scores_batch and _score_catalog must agree."""
+      
+    def setUp(self):  
+        self.topics, self.contents, self.student = make_fixture()  
+        self.algo = AdaptiveLearningAlgorithm()  
+        self.catalog = self.algo._get_catalog_index(self.contents)  
+        self.mastery = self.catalog.topic_mastery(self.student)  
+        self.knowledge_level = self.algo._knowledge_level(self.student, self.topics)  
+        self.beta_t, self.log_N = self.algo._exploration_params(self.student)
+      
+    def scalar_scores(self) -> np.ndarray:  
+        return np.array([  
+            self.algo._calculate_score(  
+                content, self.student, self.knowledge_level, self.beta_t, self.log_N  
+            )[0]  
+            for content in self.contents  
+        ])
+      
+    def batch_scores(self) -> np.ndarray:  
+        scores, _ = self.algo._calculate_scores_batch(  
+            self.catalog, self.student, self.knowledge_level, self.beta_t, self.log_N,  
+            self.mastery  
+        )  
+        return scores.copy()
+      
+    def fused_scores(self, eligible: np.ndarray) -> np.ndarray:  
+        algo = self.algo  
+        return algo.scoring.score_catalog(  
+            self.catalog, self.student, self.mastery, eligible, self.knowledge_level,  
+            algo._weight_vec, algo.zpd_delta, algo.zpd_sigma, algo.cl_optimal,  
+            self.beta_t, self.log_N  
+        )
+      
+    def test_batch_matches_scalar(self):  
+        np.testing.assert_allclose(self.batch_scores(), self.scalar_scores(), atol=1e-5)
+      
+    def test_fused_matches_scalar(self):  
+        eligible = np.ones(len(self.contents), dtype=bool)  
+        np.testing.assert_allclose(self.fused_scores(eligible), self.scalar_scores(), atol=1e-5)
+      
+    def test_fused_python_fallback_matches_scalar(self):  
+        kernel = getattr(scoring_module._score_catalog, 'py_func', scoring_module._score_catalog)  
+        eligible = np.ones(len(self.contents), dtype=bool)  
+        with mock.patch.object(scoring_module, '_score_catalog', kernel):  
+            scores = self.fused_scores(eligible)  
+        np.testing.assert_allclose(scores, self.scalar_scores(), atol=1e-5)
+      
+    def test_fused_scores_ineligible_rows_as_minus_inf(self):  
+        eligible = np.arange(len(self.contents)) % 3 != 0  
+        scores = self.fused_scores(eligible)  
+        self.assertTrue(np.isneginf(scores[~eligible]).all())  
+        np.testing.assert_allclose(scores[eligible], self.scalar_scores()[eligible], atol=1e-5)
+      
+    def test_selection_with_and_without_numba(self):  
+        picks = {}  
+        for numba_on in (True, False):  
+            topics, contents, student = make_fixture(seed=3)  
+            algo = AdaptiveLearningAlgorithm()  
+            rng = random.Random(7)  
+            picks[numba_on] = []  
+            with mock.patch.object(algorithm_module, '_NUMBA_AVAILABLE', numba_on):  
+                for _ in range(20):  
+                    content, components = algo.select_optimal_content(student, contents, topics)  
+                    picks[numba_on].append((content.id, components))  
+                    observation = Observation(  
+                        content_id=content.id, topic_id=content.topic_id,  
+                        correct=rng.random() < 0.7, time_spent=30,  
+                        engagement_score=rng.random()  
+                    )  
+                    content.interaction_count += 1  
+                    algo.update_student_state(student, observation, content)
+          
+        for (id_a, comps_a), (id_b, comps_b) in zip(picks[True], picks[False]):  
+            self.assertEqual(id_a, id_b)  
+            self.assertEqual(comps_a.keys(), comps_b.keys())  
+            for name in comps_a:  
+                self.assertAlmostEqual(comps_a[name], comps_b[name], places=5)
+
+  
+class ReplayObservationsTest(unittest.TestCase):  
+    """replay_observations must match per-observation update_student_state."""
+      
+    def test_replay_matches_sequential_updates(self):  
+        rng = random.Random(1)  
+        observations = [  
+            Observation(  
+                content_id="c", topic_id=f"t{rng.randrange(5)}", correct=rng.random() < 0.6,  
+                time_spent=1, engagement_score=rng.random()  
+            )  
+            for _ in range(300)  
+        ]  
+        content = Content(  
+            id="c", topic_id="t0", content_type=ContentType.VIDEO, difficulty=0.3,  
+            title="", description="", estimated_duration=1  
+        )  
+        algo = AdaptiveLearningAlgorithm()  
+        sequential = StudentState(student_id="a", knowledge_state={"t1": 0.5})  
+        replayed = StudentState(student_id="a", knowledge_state={"t1": 0.5})  
+        for observation in observations:  
+            algo.update_student_state(sequential, observation, content)  
+        algo.replay_observations(replayed, observations)
+          
+        self.assertEqual(sequential.knowledge_state.keys(), replayed.knowledge_state.keys())  
+        for topic_id, mastery in sequential.knowledge_state.items():  
+            self.assertAlmostEqual(mastery, replayed.knowledge_state[topic_id], places=9)  
+        self.assertEqual(sorted(sequential.mastered_topics), sorted(replayed.mastered_topics))  
+        self.assertEqual(sequential.recent_performance, replayed.recent_performance)  
+        self.assertEqual(sequential.engagement_history, replayed.engagement_history)  
+        self.assertEqual(sequential.total_interactions, replayed.total_interactions)
+
+  
+if __name__ == '__main__':  
+    unittest.main()